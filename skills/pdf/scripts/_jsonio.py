@@ -0,0 +1,27 @@
+"""JSON file helpers shared by the form scripts: orjson when available, stdlib json otherwise."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    """Read and parse a JSON file."""
+    if orjson is None:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def dump_json(data, path):
+    """Write data to path as JSON indented by 2 spaces."""
+    if orjson is None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
@@ -0,0 +1,63 @@
+"""Fixed-grid spatial index for overlap queries over [x0, y0, x1, y1] rects on one page."""
+
+import math
+from collections import defaultdict
+from itertools import chain
+
+# Rects spanning more cells than this per axis are kept off the grid and compared directly
+MAX_SPAN = 64
+
+
+def intersects(a, b):
+    """Check if two [x0, y0, x1, y1] rects overlap (y first: it separates most form rects)."""
+    # Written as negated separation tests, so a NaN coordinate never separates two rects
+    return not (a[1] >= b[3] or a[3] <= b[1] or a[0] >= b[2] or a[2] <= b[0])
+
+
+class Grid:
+    """Uniform-cell hash of rects; form fields are small and similar in size, so cells stay short."""
+
+    def __init__(self, cell=50.0):
+        self.cell = cell
+        self.buckets = defaultdict(list)
+        self.items = []  # (rect, payload)
+        self.unbucketed = []  # handles of oversized or non-finite rects
+
+    def _cells(self, rect):
+        """Return the cells rect touches, or None if it is non-finite or spans more than MAX_SPAN cells."""
+        if not all(math.isfinite(v) for v in rect):
+            return None
+        c = self.cell
+        x0, y0, x1, y1 = rect
+        cx0, cx1 = int(min(x0, x1) // c), int(max(x0, x1) // c)
+        cy0, cy1 = int(min(y0, y1) // c), int(max(y0, y1) // c)
+        if cx1 - cx0 >= MAX_SPAN or cy1 - cy0 >= MAX_SPAN:
+            return None
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def add(self, rect, payload):
+        """Index rect in every cell it touches, or keep it aside for direct comparison."""
+        handle = len(self.items)
+        self.items.append((rect, payload))
+        keys = self._cells(rect)
+        if keys is None:
+            self.unbucketed.append(handle)
+            return
+        for key in keys:
+            self.buckets[key].append(handle)
+
+    def query(self, rect):
+        """Yield the payloads of indexed rects that overlap rect, each once."""
+        keys = self._cells(rect)
+        if keys is None:
+            candidates = range(len(self.items))
+        else:
+            candidates = chain(self.unbucketed, *(self.buckets.get(key, ()) for key in keys))
+        seen = set()
+        for handle in candidates:
+            if handle in seen:
+                continue
+            seen.add(handle)
+            other, payload = self.items[handle]
+            if intersects(other, rect):
+                yield payload
@@ -1,16 +1,27 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = []
+# dependencies = ["orjson"]
 # ///
 """Validate bounding boxes in a fields.json file before filling."""
 
-import json
 import sys
+from _jsonio import load_json
+from _spatial import Grid
 
 
-def _intersects(a, b):
-    """Check if two [x0, y0, x1, y1] rects overlap."""
-    return not (a[0] >= b[2] or a[2] <= b[0] or a[1] >= b[3] or a[3] <= b[1])
+def _overlapping_pairs(rects):
+    """Map each rect index to the later indices it overlaps, using one grid index per page."""
+    grids = {}
+    overlaps = {}
+    for j, (rj, _, f) in enumerate(rects):
+        page = f.get("page_number")
+        grid = grids.get(page)
+        if grid is None:
+            grid = grids[page] = Grid()
+        for i in grid.query(rj):
+            overlaps.setdefault(i, []).append(j)
+        grid.add(rj, j)
+    return overlaps
 
 
 def validate(fields_data):
@@ -23,26 +34,25 @@ def validate(fields_data):
         rects.append((f["label_bounding_box"], "label", f))
         rects.append((f["entry_bounding_box"], "entry", f))
 
+    overlaps = _overlapping_pairs(rects)
+
     errors = 0
     for i, (ri, ti, fi) in enumerate(rects):
-        for j in range(i + 1, len(rects)):
+        for j in overlaps.get(i, ()):
             rj, tj, fj = rects[j]
-            if fi.get("page_number") != fj.get("page_number"):
-                continue
-            if _intersects(ri, rj):
-                errors += 1
-                if fi is fj:
-                    messages.append(
-                        f"FAILURE: label and entry overlap for '{fi['description']}' ({ri}, {rj})"
-                    )
-                else:
-                    messages.append(
-                        f"FAILURE: {ti} of '{fi['description']}' ({ri}) overlaps "
-                        f"{tj} of '{fj['description']}' ({rj})"
-                    )
-                if errors >= 20:
-                    messages.append("Too many errors; fix and retry")
-                    return messages
+            errors += 1
+            if fi is fj:
+                messages.append(
+                    f"FAILURE: label and entry overlap for '{fi['description']}' ({ri}, {rj})"
+                )
+            else:
+                messages.append(
+                    f"FAILURE: {ti} of '{fi['description']}' ({ri}) overlaps "
+                    f"{tj} of '{fj['description']}' ({rj})"
+                )
+            if errors >= 20:
+                messages.append("Too many errors; fix and retry")
+                return messages
 
         if ti == "entry" and "entry_text" in fi:
             font_size = fi["entry_text"].get("font_size", 14)
@@ -64,8 +74,7 @@ def main():
         print("Usage: check_boxes.py <fields.json>")
         sys.exit(1)
 
-    with open(sys.argv[1]) as f:
-        data = json.load(f)
+    data = load_json(sys.argv[1])
 
     for msg in validate(data):
         print(msg)
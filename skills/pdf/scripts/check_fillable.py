@@ -8,15 +8,35 @@ import sys
 from pypdf import PdfReader
 
 
+def _count_fields(fields):
+    """Count terminal fields under an /AcroForm /Fields array without building Field objects."""
+    total = 0
+    seen = set()
+    stack = list(fields)
+    while stack:
+        node = stack.pop().get_object()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        # Kids without /T are widgets of this field, not sub-fields
+        kids = [k for k in node.get("/Kids", []) if "/T" in k.get_object()]
+        if kids:
+            stack.extend(kids)
+        else:
+            total += 1
+    return total
+
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: check_fillable.py <input.pdf>")
         sys.exit(1)
 
-    reader = PdfReader(sys.argv[1])
-    fields = reader.get_fields()
-    if fields:
-        print(f"This PDF has fillable form fields ({len(fields)} fields found)")
+    reader = PdfReader(sys.argv[1], strict=False)
+    acroform = reader.trailer["/Root"].get("/AcroForm")
+    count = _count_fields(acroform.get_object().get("/Fields", [])) if acroform else 0
+    if count:
+        print(f"This PDF has fillable form fields ({count} fields found)")
     else:
         print("This PDF does not have fillable form fields; you will need to visually determine where to enter data")
 
@@ -1,12 +1,36 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pdf2image"]
+# dependencies = ["pymupdf"]
 # ///
 """Convert each page of a PDF to a PNG image."""
 
 import os
 import sys
-from pdf2image import convert_from_path
+from concurrent.futures import ProcessPoolExecutor
+import pymupdf
+
+DPI = 200
+MAX_DIM = 1000
+
+_doc = None
+
+
+def _open_worker(pdf_path):
+    """Open the PDF once per worker process."""
+    global _doc
+    _doc = pymupdf.open(pdf_path)
+
+
+def _render_page(output_dir, i):
+    """Rasterize one page directly at the size that fits MAX_DIM and save it as PNG."""
+    page = _doc[i]
+    w, h = page.rect.width, page.rect.height
+    zoom = min(DPI / 72, MAX_DIM / w, MAX_DIM / h)
+    pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+
+    out_path = os.path.join(output_dir, f"page_{i + 1}.png")
+    pix.save(out_path)
+    return out_path, (pix.width, pix.height)
 
 
 def main():
@@ -18,20 +42,17 @@ def main():
     output_dir = sys.argv[2]
     os.makedirs(output_dir, exist_ok=True)
 
-    images = convert_from_path(pdf_path, dpi=200)
-
-    max_dim = 1000
-    for i, image in enumerate(images):
-        w, h = image.size
-        if w > max_dim or h > max_dim:
-            scale = min(max_dim / w, max_dim / h)
-            image = image.resize((int(w * scale), int(h * scale)))
+    with pymupdf.open(pdf_path) as doc:
+        page_count = doc.page_count
 
-        out_path = os.path.join(output_dir, f"page_{i + 1}.png")
-        image.save(out_path)
-        print(f"Saved page {i + 1} as {out_path} (size: {image.size})")
+    # MuPDF documents are not thread-safe, so each worker process opens its own
+    workers = min(os.cpu_count() or 1, page_count) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker, initargs=(pdf_path,)) as pool:
+        results = pool.map(_render_page, [output_dir] * page_count, range(page_count))
+        for i, (out_path, size) in enumerate(results):
+            print(f"Saved page {i + 1} as {out_path} (size: {size})")
 
-    print(f"Converted {len(images)} pages to PNG images")
+    print(f"Converted {page_count} pages to PNG images")
 
 
 if __name__ == "__main__":
@@ -1,24 +1,39 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pypdf"]
+# dependencies = ["orjson", "pypdf"]
 # ///
 """Extract fillable form field info from a PDF to JSON."""
 
-import json
 import sys
 from pypdf import PdfReader
+from _jsonio import dump_json
+
+
+def _make_field_id_resolver():
+    """Return a function building dotted field IDs, caching each /Parent chain's prefix."""
+    prefixes = {}
+
+    def prefix_of(node):
+        if not node:
+            return None
+        key = id(node.get_object())
+        if key not in prefixes:
+            name = node.get("/T")
+            parent = prefix_of(node.get("/Parent"))
+            if name:
+                prefixes[key] = f"{parent}.{name}" if parent else str(name)
+            else:
+                prefixes[key] = parent
+        return prefixes[key]
 
-
-def _full_field_id(annotation):
-    """Walk the /Parent chain to build a dotted field ID."""
-    parts = []
-    node = annotation
-    while node:
-        name = node.get("/T")
+    def full_field_id(annotation):
+        parent = prefix_of(annotation.get("/Parent"))
+        name = annotation.get("/T")
         if name:
-            parts.append(str(name))
-        node = node.get("/Parent")
-    return ".".join(reversed(parts)) if parts else None
+            return f"{parent}.{name}" if parent else str(name)
+        return parent
+
+    return full_field_id
 
 
 def _field_dict(field, field_id):
@@ -52,42 +67,54 @@ def extract_field_info(reader: PdfReader):
     if not fields:
         return []
 
-    by_id = {}
-    possible_radios = set()
-
+    # Resolve each field ID to a small int once; the annotation scan then does a single
+    # dict lookup per widget and works on list slots instead of re-hashing the ID
+    handles = {}
+    infos = []  # leaf field dict, or None for a possible radio group
     for fid, field in fields.items():
         if field.get("/Kids"):
-            if field.get("/FT") == "/Btn":
-                possible_radios.add(fid)
-            continue
-        by_id[fid] = _field_dict(field, fid)
+            if field.get("/FT") != "/Btn":
+                continue
+            info = None
+        else:
+            info = _field_dict(field, fid)
+        handles[fid] = len(infos)
+        infos.append(info)
 
-    radios = {}
+    radios = {}  # handle -> radio group dict
 
+    full_field_id = _make_field_id_resolver()
     for page_idx, page in enumerate(reader.pages):
         for ann in page.get("/Annots", []):
-            fid = _full_field_id(ann)
-            if fid in by_id:
-                by_id[fid]["page"] = page_idx + 1
-                by_id[fid]["rect"] = [float(v) for v in ann.get("/Rect", [])]
-            elif fid in possible_radios:
-                try:
-                    on_vals = [v for v in ann["/AP"]["/N"] if v != "/Off"]
-                except (KeyError, TypeError):
-                    continue
-                if len(on_vals) == 1:
-                    rect = [float(v) for v in ann.get("/Rect", [])]
-                    if fid not in radios:
-                        radios[fid] = {
-                            "field_id": fid,
-                            "type": "radio_group",
-                            "page": page_idx + 1,
-                            "radio_options": [],
-                        }
-                    radios[fid]["radio_options"].append({"value": on_vals[0], "rect": rect})
+            fid = full_field_id(ann)
+            h = handles.get(fid)
+            if h is None:
+                continue
+            info = infos[h]
+            if info is not None:
+                info["page"] = page_idx + 1
+                info["rect"] = [float(v) for v in ann.get("/Rect", [])]
+                continue
+            try:
+                on_vals = [v for v in ann["/AP"]["/N"] if v != "/Off"]
+            except (KeyError, TypeError):
+                continue
+            if len(on_vals) == 1:
+                rect = [float(v) for v in ann.get("/Rect", [])]
+                group = radios.get(h)
+                if group is None:
+                    group = radios[h] = {
+                        "field_id": fid,
+                        "type": "radio_group",
+                        "page": page_idx + 1,
+                        "radio_options": [],
+                    }
+                group["radio_options"].append({"value": on_vals[0], "rect": rect})
 
     result = []
-    for info in by_id.values():
+    for info in infos:
+        if info is None:
+            continue
         if "page" in info:
             result.append(info)
         else:
@@ -110,8 +137,7 @@ def main():
     reader = PdfReader(sys.argv[1])
     info = extract_field_info(reader)
 
-    with open(sys.argv[2], "w") as f:
-        json.dump(info, f, indent=2)
+    dump_json(info, sys.argv[2])
     print(f"Wrote {len(info)} fields to {sys.argv[2]}")
 
 
@@ -1,12 +1,12 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pdfplumber"]
+# dependencies = ["orjson", "pdfplumber"]
 # ///
 """Extract text labels, lines, and checkboxes from a non-fillable PDF."""
 
-import json
 import sys
 import pdfplumber
+from _jsonio import dump_json
 
 
 def extract_structure(pdf_path):
@@ -26,56 +26,63 @@ def extract_structure(pdf_path):
                 "height": round(float(page.height), 1),
             })
 
-            # Text labels
-            for word in page.extract_words():
-                structure["labels"].append({
-                    "page": page_num,
-                    "text": word["text"],
-                    "x0": round(float(word["x0"]), 1),
-                    "top": round(float(word["top"]), 1),
-                    "x1": round(float(word["x1"]), 1),
-                    "bottom": round(float(word["bottom"]), 1),
-                })
+            # Parse the page content once and reuse the object lists
+            objs = page.objects
+
+            # Text labels (skip word grouping on pages without text)
+            if objs.get("char"):
+                for word in page.extract_words():
+                    structure["labels"].append({
+                        "page": page_num,
+                        "text": word["text"],
+                        "x0": round(float(word["x0"]), 1),
+                        "top": round(float(word["top"]), 1),
+                        "x1": round(float(word["x1"]), 1),
+                        "bottom": round(float(word["bottom"]), 1),
+                    })
 
             # Horizontal lines (spanning >50% of page width)
-            for line in page.lines:
-                span = abs(float(line["x1"]) - float(line["x0"]))
-                if span > page.width * 0.5:
+            min_span = page.width * 0.5
+            for line in objs.get("line", []):
+                x0, x1 = float(line["x0"]), float(line["x1"])
+                if abs(x1 - x0) > min_span:
                     structure["lines"].append({
                         "page": page_num,
                         "y": round(float(line["top"]), 1),
-                        "x0": round(float(line["x0"]), 1),
-                        "x1": round(float(line["x1"]), 1),
+                        "x0": round(x0, 1),
+                        "x1": round(x1, 1),
                     })
 
             # Checkboxes (small square-ish rectangles)
-            for rect in page.rects:
-                w = float(rect["x1"]) - float(rect["x0"])
-                h = float(rect["bottom"]) - float(rect["top"])
+            for rect in objs.get("rect", []):
+                x0, x1 = float(rect["x0"]), float(rect["x1"])
+                top, bottom = float(rect["top"]), float(rect["bottom"])
+                w = x1 - x0
+                h = bottom - top
                 if 5 <= w <= 15 and 5 <= h <= 15 and abs(w - h) < 2:
                     structure["checkboxes"].append({
                         "page": page_num,
-                        "x0": round(float(rect["x0"]), 1),
-                        "top": round(float(rect["top"]), 1),
-                        "x1": round(float(rect["x1"]), 1),
-                        "bottom": round(float(rect["bottom"]), 1),
-                        "center_x": round((float(rect["x0"]) + float(rect["x1"])) / 2, 1),
-                        "center_y": round((float(rect["top"]) + float(rect["bottom"])) / 2, 1),
+                        "x0": round(x0, 1),
+                        "top": round(top, 1),
+                        "x1": round(x1, 1),
+                        "bottom": round(bottom, 1),
+                        "center_x": round((x0 + x1) / 2, 1),
+                        "center_y": round((top + bottom) / 2, 1),
                     })
 
+            # Drop this page's parsed objects before moving on to cap memory
+            page.close()
+
     # Compute row boundaries from horizontal lines
     by_page: dict[int, list[float]] = {}
     for line in structure["lines"]:
         by_page.setdefault(line["page"], []).append(line["y"])
     for pg, ys in by_page.items():
         ys = sorted(set(ys))
-        for i in range(len(ys) - 1):
-            structure["row_boundaries"].append({
-                "page": pg,
-                "row_top": ys[i],
-                "row_bottom": ys[i + 1],
-                "row_height": round(ys[i + 1] - ys[i], 1),
-            })
+        structure["row_boundaries"].extend(
+            {"page": pg, "row_top": top, "row_bottom": bottom, "row_height": round(bottom - top, 1)}
+            for top, bottom in zip(ys, ys[1:])
+        )
 
     return structure
 
@@ -88,8 +95,7 @@ def main():
     print(f"Extracting structure from {sys.argv[1]}...")
     s = extract_structure(sys.argv[1])
 
-    with open(sys.argv[2], "w") as f:
-        json.dump(s, f, indent=2)
+    dump_json(s, sys.argv[2])
 
     print(f"Found:")
     print(f"  {len(s['pages'])} pages")
@@ -1,32 +1,40 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pypdf"]
+# dependencies = ["orjson", "pymupdf"]
 # ///
 """Fill a non-fillable PDF form by adding FreeText annotations."""
 
-import json
+import os
 import sys
-from pypdf import PdfReader, PdfWriter
-from pypdf.annotations import FreeText
+from itertools import groupby
+import pymupdf
+from _jsonio import load_json
 
+# FreeText annotations can only use the PDF base-14 fonts
+_BASE14_FONTS = {
+    "arial": "helv",
+    "helvetica": "helv",
+    "courier": "cour",
+    "courier new": "cour",
+    "times": "tiro",
+    "times new roman": "tiro",
+}
 
-def _to_pypdf_rect_from_image(bbox, iw, ih, pw, ph):
-    """Convert image-pixel bbox [x0,y0,x1,y1] to pypdf rect (origin bottom-left)."""
-    sx, sy = pw / iw, ph / ih
-    left = bbox[0] * sx
-    right = bbox[2] * sx
-    top = ph - bbox[1] * sy
-    bottom = ph - bbox[3] * sy
-    return (left, bottom, right, top)
 
+def _to_page_rect(bbox, sx, sy, dx=0.0, dy=0.0):
+    """Scale a top-left-origin bbox [x0,y0,x1,y1] by (sx, sy), then shift by (-dx, -dy), into a page rect."""
+    return (bbox[0] * sx - dx, bbox[1] * sy - dy, bbox[2] * sx - dx, bbox[3] * sy - dy)
 
-def _to_pypdf_rect_from_pdf(bbox, ph):
-    """Convert PDF-coord bbox [x0,y0,x1,y1] (y=0 at top) to pypdf rect (y=0 at bottom)."""
-    left = bbox[0]
-    right = bbox[2]
-    top = ph - bbox[1]
-    bottom = ph - bbox[3]
-    return (left, bottom, right, top)
+
+def _text_style(font, font_size, font_color):
+    """Map a fields.json text style to add_freetext_annot keyword arguments."""
+    hex_color = font_color.lstrip("#")  # accept "#FF0000" as well as "FF0000", as pypdf did
+    rgb = tuple(int(hex_color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    return {
+        "fontname": _BASE14_FONTS.get(font.lower(), "helv"),
+        "fontsize": float(font_size),
+        "text_color": rgb,
+    }
 
 
 def main():
@@ -36,55 +44,57 @@ def main():
 
     input_pdf, fields_path, output_pdf = sys.argv[1], sys.argv[2], sys.argv[3]
 
-    with open(fields_path) as f:
-        data = json.load(f)
+    data = load_json(fields_path)
 
-    reader = PdfReader(input_pdf)
-    writer = PdfWriter()
-    writer.append(reader)
+    doc = pymupdf.open(input_pdf)
 
-    # Get actual PDF dimensions per page
-    pdf_dims = {}
-    for i, page in enumerate(reader.pages):
-        mb = page.mediabox
-        pdf_dims[i + 1] = (float(mb.width), float(mb.height))
+    pages_by_num = {p["page_number"]: p for p in data.get("pages", [])}
+    # Only fields with text are placed, so only their pages need to be looked up
+    entries = [f for f in data.get("form_fields", []) if f.get("entry_text", {}).get("text", "")]
+    entries.sort(key=lambda f: f["page_number"])
 
+    styles = {}  # (font, font_size, font_color) -> add_freetext_annot kwargs
     count = 0
-    for field in data.get("form_fields", []):
-        entry_text = field.get("entry_text", {})
-        text = entry_text.get("text", "")
-        if not text:
-            continue
-
-        pg = field["page_number"]
-        pw, ph = pdf_dims[pg]
-        page_info = next(p for p in data["pages"] if p["page_number"] == pg)
-
+    for pg, page_entries in groupby(entries, key=lambda f: f["page_number"]):
+        page = doc[pg - 1]
+        page_info = pages_by_num[pg]
         if "pdf_width" in page_info:
-            rect = _to_pypdf_rect_from_pdf(field["entry_bounding_box"], ph)
+            # PDF coordinates are measured from the MediaBox's top-left corner, while MuPDF
+            # page space starts at the CropBox's, so shift by the CropBox offset
+            sx = sy = 1.0
+            dx, dy = page.cropbox_position
+            to_page = pymupdf.Identity
         else:
-            iw = page_info["image_width"]
-            ih = page_info["image_height"]
-            rect = _to_pypdf_rect_from_image(field["entry_bounding_box"], iw, ih, pw, ph)
-
-        font = entry_text.get("font", "Arial")
-        font_size = str(entry_text.get("font_size", 14)) + "pt"
-        font_color = entry_text.get("font_color", "000000")
-
-        annotation = FreeText(
-            text=text,
-            rect=rect,
-            font=font,
-            font_size=font_size,
-            font_color=font_color,
-            border_color=None,
-            background_color=None,
-        )
-        writer.add_annotation(page_number=pg - 1, annotation=annotation)
-        count += 1
-
-    with open(output_pdf, "wb") as f:
-        writer.write(f)
+            # Page images are rendered from page.rect, which is the page as displayed, so
+            # pixels are scaled to it and then mapped back through any /Rotate
+            sx = page.rect.width / page_info["image_width"]
+            sy = page.rect.height / page_info["image_height"]
+            dx = dy = 0.0
+            to_page = page.derotation_matrix
+
+        for field in page_entries:
+            rect = pymupdf.Rect(_to_page_rect(field["entry_bounding_box"], sx, sy, dx, dy)) * to_page
+            entry_text = field["entry_text"]
+            key = (
+                entry_text.get("font", "Arial"),
+                entry_text.get("font_size", 14),
+                entry_text.get("font_color", "000000"),
+            )
+            style = styles.get(key)
+            if style is None:
+                style = styles[key] = _text_style(*key)
+
+            page.add_freetext_annot(rect, entry_text["text"], **style)
+            count += 1
+
+    # Annotations are added to the open document in place; no object-graph copy to re-serialize.
+    # MuPDF cannot rewrite the file it has open, so filling in place appends an incremental
+    # update; save() requires the exact name the document was opened with for that
+    if os.path.realpath(output_pdf) == os.path.realpath(input_pdf):
+        doc.save(doc.name, incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+    else:
+        doc.save(output_pdf)
+    doc.close()
 
     print(f"Added {count} text annotations and saved to {output_pdf}")
 
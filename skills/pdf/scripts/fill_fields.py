@@ -1,28 +1,44 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pypdf"]
+# dependencies = ["orjson", "pypdf>=5"]
 # ///
 """Fill fillable PDF form fields from a JSON values file."""
 
-import json
 import sys
-from pypdf import PdfReader, PdfWriter
-
-
-def _full_field_id(annotation):
-    parts = []
-    node = annotation
-    while node:
-        name = node.get("/T")
+from pypdf import PdfWriter
+from _jsonio import load_json
+
+
+def _make_field_id_resolver():
+    """Return a function building dotted field IDs, caching each /Parent chain's prefix."""
+    prefixes = {}
+
+    def prefix_of(node):
+        if not node:
+            return None
+        key = id(node.get_object())
+        if key not in prefixes:
+            name = node.get("/T")
+            parent = prefix_of(node.get("/Parent"))
+            if name:
+                prefixes[key] = f"{parent}.{name}" if parent else str(name)
+            else:
+                prefixes[key] = parent
+        return prefixes[key]
+
+    def full_field_id(annotation):
+        parent = prefix_of(annotation.get("/Parent"))
+        name = annotation.get("/T")
         if name:
-            parts.append(str(name))
-        node = node.get("/Parent")
-    return ".".join(reversed(parts)) if parts else None
+            return f"{parent}.{name}" if parent else str(name)
+        return parent
+
+    return full_field_id
 
 
-def _get_field_info(reader):
-    """Minimal field info extraction for validation."""
-    fields = reader.get_fields() or {}
+def _get_field_info(pdf):
+    """Minimal field info extraction for validation (works on a PdfReader or PdfWriter)."""
+    fields = pdf.get_fields() or {}
     by_id = {}
     possible_radios = set()
 
@@ -45,9 +61,10 @@ def _get_field_info(reader):
         by_id[fid] = info
 
     radios = {}
-    for page_idx, page in enumerate(reader.pages):
+    full_field_id = _make_field_id_resolver()
+    for page_idx, page in enumerate(pdf.pages):
         for ann in page.get("/Annots", []):
-            fid = _full_field_id(ann)
+            fid = full_field_id(ann)
             if fid in by_id:
                 by_id[fid]["page"] = page_idx + 1
             elif fid in possible_radios:
@@ -93,11 +110,12 @@ def main():
 
     input_pdf, values_path, output_pdf = sys.argv[1], sys.argv[2], sys.argv[3]
 
-    with open(values_path) as f:
-        values = json.load(f)
+    values = load_json(values_path)
 
-    reader = PdfReader(input_pdf)
-    field_info = _get_field_info(reader)
+    # Parse the input once; incremental mode writes the original bytes followed by
+    # only the changed objects instead of re-serializing the whole document
+    writer = PdfWriter(input_pdf, incremental=True)
+    field_info = _get_field_info(writer)
 
     # Validate
     has_error = False
@@ -128,7 +146,6 @@ def main():
         pg = entry.get("page", 1)
         by_page.setdefault(pg, {})[entry["field_id"]] = entry["value"]
 
-    writer = PdfWriter(clone_from=reader)
     for pg, vals in by_page.items():
         writer.update_page_form_field_values(writer.pages[pg - 1], vals, auto_regenerate=False)
     writer.set_need_appearances_writer(True)
@@ -1,12 +1,12 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["Pillow"]
+# dependencies = ["orjson", "Pillow"]
 # ///
 """Draw bounding boxes on a page image for visual validation of fields.json."""
 
-import json
 import sys
 from PIL import Image, ImageDraw
+from _jsonio import load_json
 
 
 def main():
@@ -19,8 +19,7 @@ def main():
     input_path = sys.argv[3]
     output_path = sys.argv[4]
 
-    with open(fields_path) as f:
-        data = json.load(f)
+    data = load_json(fields_path)
 
     img = Image.open(input_path)
     draw = ImageDraw.Draw(img)